@@ -1,5 +1,9 @@
 """Invariant checker package (core + terminal UI + CLI)."""
 
-from .invariant_checker_core import InvariantCheckResult, check_invariants
+from .invariant_checker_core import (
+    InvariantCheckResult,
+    check_invariants,
+    check_invariants_stream,
+)
 
-__all__ = ["InvariantCheckResult", "check_invariants"]
+__all__ = ["InvariantCheckResult", "check_invariants", "check_invariants_stream"]
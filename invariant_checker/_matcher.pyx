@@ -0,0 +1,130 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+"""
+Compiled variant of the occurrence-matching kernel.
+
+Mirrors _match_all and its helpers in `invariant_checker_core`, with typed
+indices and buffers so the matching loop runs without interpreter dispatch.
+Loaded opportunistically via pyximport; the pure-Python kernel remains the
+reference implementation.
+"""
+
+
+cdef Py_ssize_t _bsearch(const long long[::1] starts, Py_ssize_t lo,
+                         Py_ssize_t hi, long long min_pos) noexcept nogil:
+    cdef Py_ssize_t mid
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if starts[mid] < min_pos:
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
+
+
+cdef long long _next_alive(const long long[::1] starts, Py_ssize_t lo,
+                           Py_ssize_t hi, long long min_pos,
+                           unsigned char[::1] consumed,
+                           int length) noexcept nogil:
+    cdef Py_ssize_t idx = _bsearch(starts, lo, hi, min_pos)
+    cdef long long start
+    while idx < hi:
+        start = starts[idx]
+        if not (consumed[start]
+                or consumed[start + 1]
+                or (length == 3 and consumed[start + 2])):
+            return start
+        idx += 1
+    return -1
+
+
+cdef bint _complete_tail(const long long[::1] starts,
+                         const long long[::1] bounds,
+                         unsigned char[::1] consumed,
+                         int branch, long long pos) noexcept nogil:
+    cdef int lits[4]
+    cdef long long hits[4]
+    cdef int k, n_lits, lit, length
+    cdef long long start, i
+    if branch == 1:
+        lits[0] = 3; lits[1] = 4; lits[2] = 11; n_lits = 3
+    elif branch == 2:
+        lits[0] = 6; lits[1] = 11; n_lits = 2
+    else:
+        lits[0] = 8; lits[1] = 9; lits[2] = 10; lits[3] = 11; n_lits = 4
+    for k in range(n_lits):
+        lit = lits[k]
+        length = 3 if lit >= 10 else 2
+        start = _next_alive(starts, bounds[lit], bounds[lit + 1], pos,
+                            consumed, length)
+        if start == -1:
+            return False
+        hits[k] = start
+        pos = start + length
+    for k in range(n_lits):
+        lit = lits[k]
+        start = hits[k]
+        for i in range(start, start + (3 if lit >= 10 else 2)):
+            consumed[i] = 1
+    return True
+
+
+def match_all(const long long[::1] starts, const long long[::1] bounds,
+              unsigned char[::1] consumed):
+    """Typed counterpart of invariant_checker_core._match_all."""
+    cdef long long count1 = 0, count2 = 0, count3 = 0
+    cdef Py_ssize_t idx0, idx1, idx2, idx5, idx7
+    cdef long long t0, t1, head
+    cdef int branch
+    cdef bint matched
+    for idx0 in range(bounds[0], bounds[1]):
+        t0 = starts[idx0]
+        if consumed[t0] or consumed[t0 + 1]:
+            continue
+        matched = False
+        idx1 = _bsearch(starts, bounds[1], bounds[2], t0 + 2)
+        while idx1 < bounds[2] and not matched:
+            t1 = starts[idx1]
+            idx1 += 1
+            if consumed[t1] or consumed[t1 + 1]:
+                continue
+            idx2 = _bsearch(starts, bounds[2], bounds[3], t1 + 2)
+            idx5 = _bsearch(starts, bounds[5], bounds[6], t1 + 2)
+            idx7 = _bsearch(starts, bounds[7], bounds[8], t1 + 2)
+            while True:
+                head = -1
+                branch = 0
+                if idx2 < bounds[3]:
+                    head = starts[idx2]
+                    branch = 1
+                if idx5 < bounds[6] and (head == -1 or starts[idx5] < head):
+                    head = starts[idx5]
+                    branch = 2
+                if idx7 < bounds[8] and (head == -1 or starts[idx7] < head):
+                    head = starts[idx7]
+                    branch = 3
+                if head == -1:
+                    break
+                if branch == 1:
+                    idx2 += 1
+                elif branch == 2:
+                    idx5 += 1
+                else:
+                    idx7 += 1
+                if consumed[head] or consumed[head + 1]:
+                    continue
+                if _complete_tail(starts, bounds, consumed, branch, head + 2):
+                    consumed[t0] = 1
+                    consumed[t0 + 1] = 1
+                    consumed[t1] = 1
+                    consumed[t1 + 1] = 1
+                    consumed[head] = 1
+                    consumed[head + 1] = 1
+                    if branch == 1:
+                        count1 += 1
+                    elif branch == 2:
+                        count2 += 1
+                    else:
+                        count3 += 1
+                    matched = True
+                    break
+    return count1, count2, count3
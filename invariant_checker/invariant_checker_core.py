@@ -1,29 +1,36 @@
 """
 Core logic for verifying and counting T-invariants in transition logs.
+
+The hot path does not run a regex over the raw text: the input is scanned
+into per-literal occurrence lists ("T0".."T11" start positions) and the
+invariant sequences are matched over that token index. Because splicing
+matched spans out of the text can fuse neighbouring bytes into new
+tokens, the (normally empty or tiny) leftover is rescanned and rematched
+until a pass consumes nothing. The regex formulation is kept for the
+single-step `consume_one_invariant` API and as executable documentation
+of the grammar.
 """
 
 from __future__ import annotations
 
 import re
-from dataclasses import dataclass
-from typing import Tuple
+from array import array
+from bisect import bisect_left
+from typing import Iterable, List, NamedTuple, Tuple
 
-T_INVARIANT_REGEX = re.compile(
+# Combined single-pattern form of the invariant grammar. The scanner and
+# the split patterns below replaced it internally; it stays public (as
+# `T_INVARIANT_REGEX`, compiled lazily through the module __getattr__ at
+# the bottom of this file) for reference and for callers that want the
+# one-regex formulation.
+_T_INVARIANT_REGEX_SOURCE = (
     r"(T0)(.*?)(T1)(.*?)"
     r"((T2)(.*?)(T3)(.*?)(T4)|(T5)(.*?)(T6)|(T7)(.*?)(T8)(.*?)(T9)(.*?)(T10))"
-    r"(.*?)(T11)",
-    re.S,
+    r"(.*?)(T11)"
 )
 
 BranchCounts = Tuple[int, int, int]
 
-_T4_GROUP_INDEX = 10  # has T4
-_T6_GROUP_INDEX = 13  # has T6
-_T10_GROUP_INDEX = 20  # has T10
-
-# Keep only the "gaps" between the required tokens. Missing groups become ''.
-_INTER_TOKEN_GROUP_INDICES = (2, 4, 7, 9, 12, 15, 17, 19, 21)
-
 INVARIANT_DEFINITIONS = {
     1: ("T0", "T1", "T2", "T3", "T4", "T11"),
     2: ("T0", "T1", "T5", "T6", "T11"),
@@ -31,50 +38,491 @@ INVARIANT_DEFINITIONS = {
 }
 
 
-@dataclass(frozen=True)
-class InvariantCheckResult:
-    """Result of checking invariants on a transition log."""
+try:  # pragma: no cover - exercised only where regex is installed
+    import regex as _regex_mod
+except ImportError:
+    _regex_mod = None
+
+
+def _build_branch_pattern(tokens: Tuple[str, ...]):
+    """
+    Compile one branch pattern with guarded gaps between the tokens.
+
+    Each gap is `((?:[^T]|T(?!<digits>))*)`: a greedy run that cannot
+    contain the next token, which matches exactly what the lazy `(.*?)`
+    form matched (the literal still lands on its first occurrence) but
+    gives the engine nothing to re-explore inside gap text when a later
+    token is missing. Token groups stay odd-numbered and gap groups
+    even-numbered, as in the lazy form.
+
+    With the third-party `regex` engine installed the gaps are compiled
+    possessive (`*+`), discarding the useless shrink-and-retry states the
+    stdlib engine still keeps on failure; the match API is unchanged.
+    """
+    engine = _regex_mod if _regex_mod is not None else re
+    quantifier = "*+" if _regex_mod is not None else "*"
+    parts = []
+    for position, token in enumerate(tokens):
+        if position:
+            parts.append(r"((?:[^T]|T(?!" + token[1:] + r"))" + quantifier + ")")
+        parts.append("(" + token + ")")
+    return engine.compile("".join(parts))
+
+
+# One narrow pattern per invariant branch, built from the definitions
+# above. Anchoring each on its own distinguishing tokens keeps the
+# per-position dispatch on SRE's literal fast path instead of walking the
+# full 21-group alternation above. In each pattern the branch head
+# (T2/T5/T7) is capture group 5.
+_RE_INVARIANT_1 = _build_branch_pattern(INVARIANT_DEFINITIONS[1])
+_RE_INVARIANT_2 = _build_branch_pattern(INVARIANT_DEFINITIONS[2])
+_RE_INVARIANT_3 = _build_branch_pattern(INVARIANT_DEFINITIONS[3])
+
+_HEAD_GROUP_INDEX = 5
+
+_SPLIT_PATTERNS = (
+    (1, _RE_INVARIANT_1, (2, 4, 6, 8, 10)),
+    (2, _RE_INVARIANT_2, (2, 4, 6, 8)),
+    (3, _RE_INVARIANT_3, (2, 4, 6, 8, 10, 12)),
+)
+
+# Pre-bound search methods: skips the pattern-attribute lookup per call.
+_SPLIT_SEARCHERS = tuple(
+    (number, pattern.search, gaps) for number, pattern, gaps in _SPLIT_PATTERNS
+)
+
+
+def _scan_literal_occurrences(data: bytes) -> List[List[int]]:
+    """
+    Index every occurrence of the literals "T0".."T11" in `data`.
+
+    Returns one sorted start-position list per literal id (0..11). These are
+    plain substring hits, exactly as the regex literals see them: "T1" is
+    also found inside "T10", "T11" or "T12". The scan walks `bytes.find`
+    hits, so the per-byte work stays inside CPython's C search loop; with
+    NumPy installed, large inputs take a bulk word-at-a-time scan instead.
+    """
+    if _np is not None and len(data) >= 4096:
+        return _scan_literal_occurrences_bulk(data)
+    occurrences: List[List[int]] = [[] for _ in range(12)]
+    find = data.find
+    length = len(data)
+    i = find(b"T")
+    while i != -1:
+        j = i + 1
+        if j < length:
+            byte = data[j]
+            if 0x30 <= byte <= 0x39:
+                occurrences[byte - 0x30].append(i)
+                if byte == 0x31 and j + 1 < length:
+                    next_byte = data[j + 1]
+                    if next_byte == 0x30:
+                        occurrences[10].append(i)
+                    elif next_byte == 0x31:
+                        occurrences[11].append(i)
+        i = find(b"T", j)
+    return occurrences
+
+
+def _scan_literal_occurrences_bulk(data: bytes) -> List[List[int]]:
+    """
+    NumPy variant of `_scan_literal_occurrences` over raw ASCII bytes.
+
+    Candidate 'T' bytes and their trailing digits are classified with whole
+    array comparisons, so the scan runs in a handful of vectorized passes
+    (SIMD under the hood) rather than one Python iteration per hit.
+    """
+    buf = _np.frombuffer(data, dtype=_np.uint8)
+    t_starts = _np.flatnonzero(buf[:-1] == 0x54)  # ord("T"), with room for a digit
+    first_digit = buf[t_starts + 1]
+    digit_mask = (first_digit >= 0x30) & (first_digit <= 0x39)
+    t_starts = t_starts[digit_mask]
+    first_digit = first_digit[digit_mask] - 0x30
+
+    occurrences: List[List[int]] = [
+        t_starts[first_digit == literal_id].tolist() for literal_id in range(10)
+    ]
+    t1_starts = t_starts[(first_digit == 1) & (t_starts + 2 < len(buf))]
+    second_digit = buf[t1_starts + 2]
+    occurrences.append(t1_starts[second_digit == 0x30].tolist())  # T10
+    occurrences.append(t1_starts[second_digit == 0x31].tolist())  # T11
+    return occurrences
+
+
+# The matching kernel below is written against flat integer arrays so the
+# exact same source can run interpreted or be compiled by Numba when it is
+# installed. `starts` holds all occurrence start positions back to back;
+# `bounds[lit]:bounds[lit + 1]` delimits the slice for literal `lit`.
+
+
+def _bsearch(starts, lo: int, hi: int, min_pos: int) -> int:
+    """Leftmost index in starts[lo:hi] whose value is >= min_pos."""
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if starts[mid] < min_pos:
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
+
+
+def _next_alive(starts, lo: int, hi: int, min_pos: int, consumed, length: int) -> int:
+    """First unconsumed occurrence in starts[lo:hi] at or after min_pos, or -1."""
+    idx = _bsearch(starts, lo, hi, min_pos)
+    while idx < hi:
+        start = starts[idx]
+        if not (
+            consumed[start]
+            or consumed[start + 1]
+            or (length == 3 and consumed[start + 2])
+        ):
+            return start
+        idx += 1
+    return -1
+
+
+def _complete_tail(starts, bounds, consumed, branch: int, pos: int) -> bool:
+    """
+    Greedily complete a branch tail (plus the closing T11) from `pos`.
+
+    On success the chosen occurrence spans are marked consumed (the rest of
+    the match is already committed by the caller) and True is returned.
+    """
+    if branch == 1:
+        lits = (3, 4, 11, -1)
+    elif branch == 2:
+        lits = (6, 11, -1, -1)
+    else:
+        lits = (8, 9, 10, 11)
+    hit0 = hit1 = hit2 = hit3 = -1
+    k = 0
+    for lit in lits:
+        if lit == -1:
+            break
+        length = 3 if lit >= 10 else 2
+        start = _next_alive(starts, bounds[lit], bounds[lit + 1], pos, consumed, length)
+        if start == -1:
+            return False
+        if k == 0:
+            hit0 = start
+        elif k == 1:
+            hit1 = start
+        elif k == 2:
+            hit2 = start
+        else:
+            hit3 = start
+        k += 1
+        pos = start + length
+    k = 0
+    for lit in lits:
+        if lit == -1:
+            break
+        if k == 0:
+            start = hit0
+        elif k == 1:
+            start = hit1
+        elif k == 2:
+            start = hit2
+        else:
+            start = hit3
+        end = start + (3 if lit >= 10 else 2)
+        for i in range(start, end):
+            consumed[i] = 1
+        k += 1
+    return True
+
+
+def _match_all(starts, bounds, consumed):
+    """
+    Match every invariant over the occurrence index, in leftmost order.
+
+    Mirrors the lazy regex semantics within one pass over a fixed index:
+    for each T0 the first usable T1 is tried, then branch heads (T2/T5/T7)
+    in merged position order; on failure the next T1 is tried. The index
+    never changes during a pass, so a failed T0 is not retried here — but
+    splicing the matched spans out of the text can fuse surrounding bytes
+    into tokens this pass never saw, which is why `_finish_check` rescans
+    the leftover and calls the kernel again. Marks the consumed character
+    positions in `consumed` and returns the three branch counts.
+    """
+    count1 = 0
+    count2 = 0
+    count3 = 0
+    for idx0 in range(bounds[0], bounds[1]):
+        t0 = starts[idx0]
+        if consumed[t0] or consumed[t0 + 1]:
+            continue
+        matched = False
+        idx1 = _bsearch(starts, bounds[1], bounds[2], t0 + 2)
+        while idx1 < bounds[2] and not matched:
+            t1 = starts[idx1]
+            idx1 += 1
+            if consumed[t1] or consumed[t1 + 1]:
+                continue
+            # Walk the three head occurrence lists in merged position order.
+            idx2 = _bsearch(starts, bounds[2], bounds[3], t1 + 2)
+            idx5 = _bsearch(starts, bounds[5], bounds[6], t1 + 2)
+            idx7 = _bsearch(starts, bounds[7], bounds[8], t1 + 2)
+            while True:
+                head = -1
+                branch = 0
+                if idx2 < bounds[3]:
+                    head = starts[idx2]
+                    branch = 1
+                if idx5 < bounds[6] and (head == -1 or starts[idx5] < head):
+                    head = starts[idx5]
+                    branch = 2
+                if idx7 < bounds[8] and (head == -1 or starts[idx7] < head):
+                    head = starts[idx7]
+                    branch = 3
+                if head == -1:
+                    break
+                if branch == 1:
+                    idx2 += 1
+                elif branch == 2:
+                    idx5 += 1
+                else:
+                    idx7 += 1
+                if consumed[head] or consumed[head + 1]:
+                    continue
+                if _complete_tail(starts, bounds, consumed, branch, head + 2):
+                    consumed[t0] = 1
+                    consumed[t0 + 1] = 1
+                    consumed[t1] = 1
+                    consumed[t1 + 1] = 1
+                    consumed[head] = 1
+                    consumed[head + 1] = 1
+                    if branch == 1:
+                        count1 += 1
+                    elif branch == 2:
+                        count2 += 1
+                    else:
+                        count3 += 1
+                    matched = True
+                    break
+    return count1, count2, count3
 
-    was_fully_consumed: bool
-    leftover_transitions: str
-    invariant_counts: BranchCounts
-    log_length: int
-    leftover_length: int
 
+# Tail literals per branch (after the shared T0, T1 and the branch head),
+# including the closing T11. `_complete_tail` above and the generated
+# specialized matcher below are both driven by this table.
+_BRANCH_TAILS = {1: (3, 4, 11), 2: (6, 11), 3: (8, 9, 10, 11)}
 
-def _detect_invariant(match: re.Match[str]) -> int:
-    if match.group(_T4_GROUP_INDEX) is not None:
-        return 1
-    if match.group(_T6_GROUP_INDEX) is not None:
-        return 2
-    if match.group(_T10_GROUP_INDEX) is not None:
-        return 3
-    return 0  # should not happen
+# Body of the specialized interpreted matcher. It mirrors `_match_all`
+# but is kept as source text so the branch-tail ladder generated below can
+# be spliced in with the table constants folded: the fallback then
+# dispatches through plain compare-and-jump bytecode instead of walking
+# the `lits` tuples in `_complete_tail` on every candidate.
+_SPECIALIZED_LOOP_SOURCE = """\
+def match_all_specialized(starts, bounds, consumed):
+    count1 = 0
+    count2 = 0
+    count3 = 0
+    for idx0 in range(bounds[0], bounds[1]):
+        t0 = starts[idx0]
+        if consumed[t0] or consumed[t0 + 1]:
+            continue
+        matched = False
+        idx1 = _bsearch(starts, bounds[1], bounds[2], t0 + 2)
+        while idx1 < bounds[2] and not matched:
+            t1 = starts[idx1]
+            idx1 += 1
+            if consumed[t1] or consumed[t1 + 1]:
+                continue
+            idx2 = _bsearch(starts, bounds[2], bounds[3], t1 + 2)
+            idx5 = _bsearch(starts, bounds[5], bounds[6], t1 + 2)
+            idx7 = _bsearch(starts, bounds[7], bounds[8], t1 + 2)
+            while True:
+                head = -1
+                branch = 0
+                if idx2 < bounds[3]:
+                    head = starts[idx2]
+                    branch = 1
+                if idx5 < bounds[6] and (head == -1 or starts[idx5] < head):
+                    head = starts[idx5]
+                    branch = 2
+                if idx7 < bounds[8] and (head == -1 or starts[idx7] < head):
+                    head = starts[idx7]
+                    branch = 3
+                if head == -1:
+                    break
+                if branch == 1:
+                    idx2 += 1
+                elif branch == 2:
+                    idx5 += 1
+                else:
+                    idx7 += 1
+                if consumed[head] or consumed[head + 1]:
+                    continue
+                if _complete_tail_specialized(starts, bounds, consumed, branch, head + 2):
+                    consumed[t0] = 1
+                    consumed[t0 + 1] = 1
+                    consumed[t1] = 1
+                    consumed[t1 + 1] = 1
+                    consumed[head] = 1
+                    consumed[head + 1] = 1
+                    if branch == 1:
+                        count1 += 1
+                    elif branch == 2:
+                        count2 += 1
+                    else:
+                        count3 += 1
+                    matched = True
+                    break
+    return count1, count2, count3
+"""
 
 
-def _collect_unmatched_groups(match: re.Match[str]) -> str:
+def _generate_tail_ladder_source() -> str:
     """
-    Collects and concatenates all unmatched groups from a regex match object.
+    Emit `_complete_tail_specialized` source from the branch-tail table.
 
-    Returns:
-      str: A string formed by joining all non-None preserved gap groups.
+    Each branch becomes an `if branch == n:` arm with the tail walk fully
+    unrolled: literal ids, slice bounds indices and token lengths are
+    baked in as constants, and the consumed marks are written without the
+    positional `hit0..hit3` bookkeeping the shared kernel needs.
     """
-    return "".join((match.group(i) or "") for i in _INTER_TOKEN_GROUP_INDICES)
+    lines = ["def _complete_tail_specialized(starts, bounds, consumed, branch, pos):"]
+    for branch, lits in sorted(_BRANCH_TAILS.items()):
+        keyword = "if" if branch == 1 else "elif"
+        lines.append(f"    {keyword} branch == {branch}:")
+        previous_end = "pos"
+        for k, lit in enumerate(lits):
+            length = 3 if lit >= 10 else 2
+            lines.append(
+                f"        s{k} = _next_alive(starts, bounds[{lit}], "
+                f"bounds[{lit + 1}], {previous_end}, consumed, {length})"
+            )
+            lines.append(f"        if s{k} == -1:")
+            lines.append("            return False")
+            previous_end = f"s{k} + {length}"
+        for k, lit in enumerate(lits):
+            for offset in range(3 if lit >= 10 else 2):
+                lines.append(f"        consumed[s{k} + {offset}] = 1")
+        lines.append("        return True")
+    lines.append("    return False")
+    return "\n".join(lines)
+
+
+def _build_specialized_matcher():
+    """Compile and exec the generated matcher into its own namespace."""
+    source = _generate_tail_ladder_source() + "\n\n\n" + _SPECIALIZED_LOOP_SOURCE
+    namespace = {"_bsearch": _bsearch, "_next_alive": _next_alive}
+    exec(  # pylint: disable=exec-used  # source is generated from constants above
+        compile(source, "<specialized matcher>", "exec"), namespace
+    )
+    return namespace["match_all_specialized"]
+
+
+# Built before the Numba block below so the generated code binds the plain
+# interpreted helpers; the handwritten `_match_all` stays the reference and
+# Numba kernel.
+_match_all_specialized = _build_specialized_matcher()
+
+
+try:  # pragma: no cover - exercised only where numpy is installed
+    import numpy as _np
+except ImportError:
+    _np = None
+
+try:  # pragma: no cover - exercised only where numba is installed
+    from numba import njit as _njit
+
+    _bsearch = _njit(cache=True)(_bsearch)
+    _next_alive = _njit(cache=True)(_next_alive)
+    _complete_tail = _njit(cache=True)(_complete_tail)
+    _match_all_jit = _njit(cache=True)(_match_all)
+except ImportError:
+    _match_all_jit = None
+
+try:  # pragma: no cover - exercised only where Cython is installed
+    import pyximport
+
+    pyximport.install(language_level=3)
+    from . import _matcher as _cy_matcher
+except Exception:  # pylint: disable=broad-except  # compile errors, not just ImportError
+    _cy_matcher = None
+
+
+def _run_match_all(starts: "array[int]", bounds: "array[int]", length: int):
+    """Dispatch to the fastest available kernel, marking `consumed`."""
+    if _cy_matcher is not None:
+        consumed = bytearray(length)
+        counts = _cy_matcher.match_all(starts, bounds, consumed)
+        return counts, consumed
+    if _match_all_jit is not None:
+        starts_arr = _np.frombuffer(starts, dtype=_np.int64)
+        bounds_arr = _np.frombuffer(bounds, dtype=_np.int64)
+        consumed = _np.zeros(length, dtype=_np.uint8)
+        counts = _match_all_jit(starts_arr, bounds_arr, consumed)
+        return counts, consumed
+    consumed = bytearray(length)
+    counts = _match_all_specialized(starts, bounds, consumed)
+    return counts, consumed
+
+
+class InvariantCheckResult(NamedTuple):
+    """
+    Result of checking invariants on a transition log.
+
+    A NamedTuple rather than a frozen dataclass: same immutable, named
+    fields, but reads go through C-level tuple slots and construction
+    skips the synthesized frozen `__setattr__`.
+
+    `log_length` and `leftover_length` share the input's unit: characters
+    when the log came in as str, bytes when it came in as bytes or as a
+    chunk stream.
+    """
+
+    was_fully_consumed: bool
+    leftover_transitions: str
+    invariant_counts: BranchCounts
+    log_length: int
+    leftover_length: int
+    original_token_count: int = 0
+    leftover_token_count: int = 0
 
 
 def consume_one_invariant(transition_log: str) -> Tuple[str, int, bool]:
     """
     Find and remove a single invariant match from `transition_log`.
 
+    Kept as a single-step API for callers that want to inspect removals one
+    at a time; `check_invariants` no longer uses it on the hot path.
+
+    Each branch pattern is searched separately and the candidates are
+    ordered by (match start, branch head position), which reproduces the
+    combined alternation's leftmost-lazy choice: candidates sharing a start
+    also share the same T1, so the earliest branch head wins. Branch
+    identity falls out of which pattern matched, so no group inspection
+    (`m.group(9) is not None`-style probing) is ever needed.
+
     Returns (remaining_log, matched_invariant, did_consume).
       matched_invariant: 1,2,3 for which invariant matched; 0 if no match.
     """
-    match = T_INVARIANT_REGEX.search(transition_log)
-    if not match:
+    # Every branch starts with the literal "T0", so one C-level find gives
+    # the earliest possible match start; searching from there means none of
+    # the engines rescans the T0-free prefix.
+    first_t0 = transition_log.find("T0")
+    if first_t0 == -1:
+        return transition_log, 0, False
+    best = None
+    best_key = None
+    for invariant_number, search, gap_indices in _SPLIT_SEARCHERS:
+        match = search(transition_log, first_t0)
+        if match is None:
+            continue
+        key = (match.start(), match.start(_HEAD_GROUP_INDEX))
+        if best_key is None or key < best_key:
+            best = (invariant_number, match, gap_indices)
+            best_key = key
+    if best is None:
         return transition_log, 0, False
 
-    matched_invariant = _detect_invariant(match)
-    unmatched_groups = _collect_unmatched_groups(match)
+    matched_invariant, match, gap_indices = best
+    # One C-level group() call returns every gap at once instead of one
+    # boundary crossing per index.
+    unmatched_groups = "".join(match.group(*gap_indices))
     remaining_log = (
         transition_log[: match.start()]
         + unmatched_groups
@@ -83,32 +531,215 @@ def consume_one_invariant(transition_log: str) -> Tuple[str, int, bool]:
     return remaining_log, matched_invariant, True
 
 
-def check_invariants(transition_log: str) -> InvariantCheckResult:
+def check_invariants(transition_log: "str | bytes") -> InvariantCheckResult:
     """
-    Repeatedly remove invariant matches and count each branch.
+    Count invariant matches per branch and compute the leftover log.
+
+    Accepts either text or raw bytes; the scan always runs over a bytes
+    buffer (str input is UTF-8 encoded once) so the low-level scanners can
+    use the buffer protocol without per-slice str allocation. The removed
+    token spans are pure ASCII, so byte slicing never splits a character
+    and the leftover decodes cleanly at the end.
+
+    Instead of running the backtracking regex over the raw text, the input
+    is indexed into per-literal occurrence lists and matched on those
+    indices, each T0 occurrence being tried once per pass in position
+    order. Removing a match splices its neighbours together, which can
+    create a token that no earlier pass saw, so the leftover is reindexed
+    and rematched until a pass consumes nothing — giving the same counts
+    and fully-consumed verdict as the one-at-a-time splice-and-rescan
+    loop (see `_finish_check` for the one caveat on leftover layout).
     """
     transition_log_length = len(transition_log)
+    if isinstance(transition_log, str):
+        data = transition_log.encode("utf-8")
+    else:
+        # bytes-like input (bytes, bytearray, mmap) is scanned in place:
+        # the scanners only need find()/indexing and slices below come out
+        # as bytes, so no up-front copy is made.
+        data = transition_log
+
+    occurrences = _scan_literal_occurrences(data)
+    return _finish_check(data, transition_log_length, occurrences)
 
-    invariant_1_count = 0
-    invariant_2_count = 0
-    invariant_3_count = 0
 
-    remaining_log = transition_log
+def _merge_window_occurrences(
+    window: bytes, base: int, limit: int, occurrences: List[List[int]]
+) -> None:
+    """Scan `window` and append hits that start before `limit`, shifted by `base`."""
+    window_occurrences = _scan_literal_occurrences(window)
+    for literal_id in range(12):
+        hits = window_occurrences[literal_id]
+        cut = bisect_left(hits, limit)
+        if base:
+            occurrences[literal_id].extend(start + base for start in hits[:cut])
+        else:
+            occurrences[literal_id].extend(hits[:cut])
+
+
+def check_invariants_stream(chunks: Iterable[bytes]) -> InvariantCheckResult:
+    """
+    Check invariants over an iterable of byte chunks (e.g. a piped log).
+
+    The occurrence index is built incrementally as chunks arrive, so the
+    scan overlaps the read loop instead of waiting for the full input. The
+    last two bytes of each chunk are deferred and rescanned with the next
+    one, so a token split across a chunk boundary is still indexed exactly
+    once. The inter-token gaps are unbounded, which means an invariant
+    opened in one chunk may only close much later; exact matching and the
+    exact leftover therefore still need the assembled input, which is
+    joined once at the end and matched with the same kernel as
+    `check_invariants`.
+    """
+    occurrences: List[List[int]] = [[] for _ in range(12)]
+    parts: List[bytes] = []
+    carry = b""
+    offset = 0
+    for chunk in chunks:
+        if not chunk:
+            continue
+        if not isinstance(chunk, bytes):
+            # Callers recycling a readinto() buffer hand us transient
+            # views; snapshot them, since the data is retained until the
+            # final match.
+            chunk = bytes(chunk)
+        parts.append(chunk)
+        if len(chunk) >= 4:
+            # Scan the chunk in place: concatenating `carry + chunk` would
+            # copy the whole chunk again just to cover the boundary, so the
+            # boundary is rescanned through a tiny window instead.
+            if carry:
+                boundary = carry + chunk[:2]
+                _merge_window_occurrences(
+                    boundary, offset - len(carry), len(carry), occurrences
+                )
+            limit = len(chunk) - 2
+            _merge_window_occurrences(chunk, offset, limit, occurrences)
+            carry = chunk[limit:]
+        else:
+            window = carry + chunk
+            limit = max(0, len(window) - 2)
+            _merge_window_occurrences(window, offset - len(carry), limit, occurrences)
+            carry = window[limit:]
+        offset += len(chunk)
+    if carry:
+        _merge_window_occurrences(carry, offset - len(carry), len(carry), occurrences)
+    data = b"".join(parts)
+    return _finish_check(data, len(data), occurrences)
+
 
+def _finish_check(
+    data: bytes, log_length: int, occurrences: List[List[int]]
+) -> InvariantCheckResult:
+    """
+    Match over a prebuilt occurrence index and assemble the result.
+
+    Matching runs to a fixed point: splicing matched spans out of the text
+    joins their neighbours, which can fuse bytes into a token that did not
+    exist before (consuming the "T1" prefix of a "T10" leaves a "0" that a
+    preceding bare "T" turns into a fresh "T0"). The leftover of each pass
+    is therefore rescanned and rematched, accumulating counts, until a
+    pass matches nothing. This reproduces the counts and the
+    fully-consumed verdict of the one-at-a-time splice-and-rescan loop;
+    on inputs with several equivalent match choices the unmatched spans
+    left behind may be picked in a different order, so the leftover text
+    can differ in layout (never in whether there is any). The leftover is
+    normally empty or tiny, so the extra passes are cheap.
+    """
+    invariant_1_count = invariant_2_count = invariant_3_count = 0
+    original_token_count = -1
+    leftover_bytes = b""
+    has_noise = False
+    # `log_length` counts characters for str input and bytes for bytes
+    # input; the leftover must be measured in the same unit so the two
+    # lengths (and the consumed ratio derived from them) stay comparable.
+    # They coincide exactly when the str input is pure ASCII, so equality
+    # with the buffer size identifies the byte-counted case.
+    lengths_in_bytes = log_length == len(data)
     while True:
-        remaining_log, matched_invariant, did_consume = consume_one_invariant(
-            remaining_log
-        )
-        if not did_consume:
+        # Unboxed int64 storage: indexing stays on array.array's C fast
+        # path in the interpreted kernel, and the buffer protocol hands the
+        # same memory to the Cython and NumPy/Numba paths without a
+        # per-element copy.
+        starts = array("q")
+        bounds = array("q", [0] * 13)
+        for literal_id in range(12):
+            starts.extend(occurrences[literal_id])
+            bounds[literal_id + 1] = len(starts)
+        if original_token_count < 0:
+            # Literals 0..9 hold exactly one entry per `T<digits>` token
+            # (the first digit decides the list), so the first pass's value
+            # is the r"T\d+" count of the original input.
+            original_token_count = bounds[10]
+
+        # Every invariant needs a T0, a T1 and a closing T11; if any of
+        # those lists is empty nothing can match, so skip the kernel
+        # dispatch and treat the whole input as leftover.
+        if bounds[1] and bounds[2] - bounds[1] and bounds[12] - bounds[11]:
+            counts, consumed = _run_match_all(starts, bounds, len(data))
+        else:
+            counts, consumed = (0, 0, 0), bytearray(len(data))
+        pass_count_1, pass_count_2, pass_count_3 = counts
+        invariant_1_count += pass_count_1
+        invariant_2_count += pass_count_2
+        invariant_3_count += pass_count_3
+
+        if not isinstance(consumed, bytearray):  # numpy buffer from the jit path
+            consumed = bytearray(consumed)
+
+        # Unconsumed runs are located with bytearray.find, so run
+        # boundaries come from C-level memchr scans instead of a per-byte
+        # Python loop.
+        pieces: list[bytes] = []
+        has_noise = False
+        data_length = len(data)
+        find_in_consumed = consumed.find
+        pos = find_in_consumed(0)
+        while pos != -1:
+            end = find_in_consumed(1, pos)
+            if end == -1:
+                end = data_length
+            piece = data[pos:end]
+            pieces.append(piece)
+            if not has_noise and not piece.isspace():
+                has_noise = True
+            if end == data_length:
+                break
+            pos = find_in_consumed(0, end)
+
+        if not has_noise:
+            # Nothing but whitespace survived: the leftover strips to "".
+            leftover_bytes = b""
+            break
+        leftover_bytes = b"".join(pieces)
+        if not (pass_count_1 or pass_count_2 or pass_count_3):
+            break  # fixed point: this pass consumed nothing
+        # Cheap gate before another pass: any further match needs at least
+        # a "T0" and a closing "T11" in the spliced text (a "T11" hit also
+        # supplies the "T1" occurrence). Two substring probes beat a full
+        # reindex of a leftover that cannot match anyway.
+        if b"T0" not in leftover_bytes or b"T11" not in leftover_bytes:
             break
-        if matched_invariant == 1:
-            invariant_1_count += 1
-        elif matched_invariant == 2:
-            invariant_2_count += 1
-        elif matched_invariant == 3:
-            invariant_3_count += 1
+        data = leftover_bytes
+        occurrences = _scan_literal_occurrences(data)
 
-    leftover_transitions = remaining_log.strip()
+    if has_noise:
+        leftover_transitions = leftover_bytes.decode("utf-8", "replace").strip()
+        # Same first-digit identity as original_token_count above, on the
+        # (typically small) leftover; diagnostics then need no rescans.
+        leftover_occurrences = _scan_literal_occurrences(leftover_bytes)
+        leftover_token_count = sum(
+            len(leftover_occurrences[digit]) for digit in range(10)
+        )
+    else:
+        leftover_transitions = ""
+        leftover_token_count = 0
+    if lengths_in_bytes:
+        # Re-encoding the (stripped, typically tiny) leftover gives its
+        # byte length without having decoded the whole input.
+        leftover_length = len(leftover_transitions.encode("utf-8"))
+    else:
+        leftover_length = len(leftover_transitions)
 
     was_fully_consumed = leftover_transitions == ""
 
@@ -116,6 +747,17 @@ def check_invariants(transition_log: str) -> InvariantCheckResult:
         was_fully_consumed=was_fully_consumed,
         leftover_transitions=leftover_transitions,
         invariant_counts=(invariant_1_count, invariant_2_count, invariant_3_count),
-        log_length=transition_log_length,
-        leftover_length=len(leftover_transitions),
+        log_length=log_length,
+        leftover_length=leftover_length,
+        original_token_count=original_token_count,
+        leftover_token_count=leftover_token_count,
     )
+
+
+def __getattr__(name: str):
+    """Compile the public reference pattern on first access (PEP 562)."""
+    if name == "T_INVARIANT_REGEX":
+        pattern = re.compile(_T_INVARIANT_REGEX_SOURCE, re.S)
+        globals()["T_INVARIANT_REGEX"] = pattern
+        return pattern
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -4,6 +4,7 @@ Terminal presentation helpers for the invariant checker.
 
 from __future__ import annotations
 
+import functools
 import os
 import re
 import sys
@@ -14,10 +15,32 @@ from .invariant_checker_core import INVARIANT_DEFINITIONS, InvariantCheckResult
 
 VERSION = "1.3.0"
 
-_TOKEN_RE = re.compile(r"T\d+")
 _TOKEN_CAPTURE_RE = re.compile(r"(T\d+)")
+# Pre-bound like the searchers in the core module: the call site then
+# skips the pattern-attribute lookup.
+_sub_token_capture = _TOKEN_CAPTURE_RE.sub
 _UNICODE_DECORATION_SAMPLE = "█①②③✨┌─┐│└┘…‑"
 
+# ASCII stand-ins for the decoration glyphs, applied in one translate()
+# pass when a stream cannot encode them.
+_ASCII_FALLBACK_TABLE = str.maketrans(
+    {
+        "█": "#",
+        "…": "...",
+        "‑": "-",
+        "①": "1",
+        "②": "2",
+        "③": "3",
+        "✨": "*",
+        "┌": "+",
+        "┐": "+",
+        "└": "+",
+        "┘": "+",
+        "─": "-",
+        "│": "|",
+    }
+)
+
 
 class Colors:  # pylint: disable=too-few-public-methods
     """ANSI color escape codes for styled terminal output."""
@@ -31,10 +54,9 @@ class Colors:  # pylint: disable=too-few-public-methods
     CYAN = "\033[36m"
 
 
-def supports_color(stream) -> bool:
-    """Return True when `stream` likely supports ANSI colors."""
-    if not hasattr(stream, "isatty") or not stream.isatty():
-        return False
+@functools.lru_cache(maxsize=None)
+def _env_allows_color() -> bool:
+    """Environment half of the color probe, cached per process."""
     if os.environ.get("NO_COLOR"):
         return False
     if sys.platform == "win32":  # pyright: ignore[reportUnreachableCode]
@@ -42,11 +64,16 @@ def supports_color(stream) -> bool:
     return True
 
 
-def supports_unicode(stream) -> bool:
-    """Return True when `stream` likely supports the Unicode glyphs we print."""
-    encoding = getattr(stream, "encoding", None)
-    if not encoding:
-        return True
+def supports_color(stream) -> bool:
+    """Return True when `stream` likely supports ANSI colors."""
+    if not hasattr(stream, "isatty") or not stream.isatty():
+        return False
+    return _env_allows_color()
+
+
+@functools.lru_cache(maxsize=None)
+def _encoding_supports_decorations(encoding: str) -> bool:
+    """Cached per-codec probe: can `encoding` encode our decoration glyphs?"""
     normalized = encoding.lower().replace("_", "-")
     if normalized in {"utf-8", "utf-8-sig", "utf-16", "utf-16-le", "utf-16-be"}:
         return True
@@ -57,6 +84,19 @@ def supports_unicode(stream) -> bool:
     return True
 
 
+def supports_unicode(stream) -> bool:
+    """Return True when `stream` likely supports the Unicode glyphs we print."""
+    encoding = getattr(stream, "encoding", None)
+    if not encoding:
+        return True
+    return _encoding_supports_decorations(encoding)
+
+
+def _plain_style(text: str, _color_code: str = "") -> str:
+    """No-color stand-in for the UI style helpers: returns text unchanged."""
+    return text
+
+
 @dataclass
 class UI:  # pylint: disable=missing-function-docstring
     """Small console UI facade used by the CLI renderer."""
@@ -67,25 +107,22 @@ class UI:  # pylint: disable=missing-function-docstring
     verbose: bool = False
     stream: TextIO = sys.stdout
 
+    def __post_init__(self) -> None:
+        # Runtime specialization: with color off every style helper is the
+        # identity, so bind it directly on the instance and skip both the
+        # per-call color branch and the f-string wrap.
+        if not self.color:
+            plain = _plain_style
+            self.style = plain
+            self.bold = self.dim = plain
+            self.green = self.yellow = plain
+            self.red = self.cyan = plain
+
     def _safe_write_line(self, text: str) -> None:
         try:
             self.stream.write(f"{text}\n")
         except UnicodeEncodeError:
-            cleaned = (
-                text.replace("█", "#")
-                .replace("…", "...")
-                .replace("‑", "-")
-                .replace("①", "1")
-                .replace("②", "2")
-                .replace("③", "3")
-                .replace("✨", "*")
-                .replace("┌", "+")
-                .replace("┐", "+")
-                .replace("└", "+")
-                .replace("┘", "+")
-                .replace("─", "-")
-                .replace("│", "|")
-            )
+            cleaned = text.translate(_ASCII_FALLBACK_TABLE)
             try:
                 self.stream.write(f"{cleaned}\n")
             except UnicodeEncodeError:
@@ -130,16 +167,34 @@ class UI:  # pylint: disable=missing-function-docstring
             self._safe_write_line(self.yellow(text))
 
 
+# Bar segments drawn per report come from a small range, so the repeated
+# strings are pooled once at import (and grown lazily past the default
+# width) instead of being rebuilt on every `_render_bar` call.
+_MAX_PREBUILT_BAR_WIDTH = 40
+_BAR_SEGMENTS = {
+    char: [char * i for i in range(_MAX_PREBUILT_BAR_WIDTH + 1)]
+    for char in ("█", "#", ".")
+}
+
+
+def _bar_segment(char: str, count: int) -> str:
+    """Return `char * count` from the segment pool, growing it if needed."""
+    segments = _BAR_SEGMENTS.get(char)
+    if segments is None:
+        segments = _BAR_SEGMENTS[char] = [""]
+    if len(segments) <= count:
+        # Grow by slicing one max-width template instead of concatenating
+        # per length.
+        template = char * count
+        segments.extend(template[:i] for i in range(len(segments), count + 1))
+    return segments[count]
+
+
 def _render_bar(n: int, total: int, width: int, color_fn, *, fill: str = "█") -> str:
     """Render a proportional bar with optional coloring."""
     filled = int(round((n / total) * width)) if total else 0
     empty = width - filled
-    return color_fn(fill * filled) + ("." * empty)
-
-
-def _count_tokens(text: str) -> int:
-    """Count how many `T<number>` tokens exist in `text`."""
-    return len(_TOKEN_RE.findall(text))
+    return color_fn(_bar_segment(fill, filled)) + _bar_segment(".", empty)
 
 
 def render_banner(ui: UI) -> Iterable[str]:
@@ -159,26 +214,39 @@ def _format_invariant_label(tokens: Tuple[str, ...]) -> str:
     return "..".join(tokens)
 
 
-def render_counts(ui: UI, counts: Tuple[int, int, int], width: int) -> Iterable[str]:
-    """Return formatted count lines for each invariant branch."""
-    total = sum(counts)
-    markers = ("①", "②", "③") if ui.decorations_enabled else ("1", "2", "3")
+def _bake_count_labels(markers: Tuple[str, str, str]) -> Tuple[Tuple[str, ...], str]:
+    """Pre-format the count labels and row format for a marker set."""
     labels = tuple(
         f"{markers[invariant_id - 1]} {_format_invariant_label(tokens)}"
         for invariant_id, tokens in sorted(INVARIANT_DEFINITIONS.items())
     )
-    max_label = max(len(l) for l in labels)
+    max_label = max(len(label) for label in labels)
     fmt = f"  {{:<{max_label}}}  {{invariant_bar}}  {{count}}  ({{pct:.1f}}%)"
+    return labels, fmt
+
+
+# The invariant definitions are constants, so the labels and row formats
+# are baked once at import instead of being sorted and formatted per report.
+_COUNT_LABELS_UNICODE = _bake_count_labels(("①", "②", "③"))
+_COUNT_LABELS_ASCII = _bake_count_labels(("1", "2", "3"))
 
+
+def render_counts(ui: UI, counts: Tuple[int, int, int], width: int) -> Iterable[str]:
+    """Return formatted count lines for each invariant branch."""
+    total = sum(counts)
+    labels, fmt = (
+        _COUNT_LABELS_UNICODE if ui.decorations_enabled else _COUNT_LABELS_ASCII
+    )
+
+    green = ui.green
+    fill = "█" if ui.decorations_enabled else "#"
     lines: list[str] = ["", ui.bold("Counts:")]
     for label, n in zip(labels, counts):
         pct = (n * 100.0 / total) if total else 0.0
-        invariant_bar = _render_bar(
-            n, total, width, ui.green, fill=("█" if ui.decorations_enabled else "#")
-        )
+        invariant_bar = _render_bar(n, total, width, green, fill=fill)
         lines.append(
             fmt.format(
-                label, invariant_bar=invariant_bar, count=ui.green(str(n)), pct=pct
+                label, invariant_bar=invariant_bar, count=green(str(n)), pct=pct
             )
         )
     lines.append("")
@@ -187,14 +255,15 @@ def render_counts(ui: UI, counts: Tuple[int, int, int], width: int) -> Iterable[
 
 
 def render_diagnostics(
-    ui: UI, original_text: str, result: InvariantCheckResult
+    ui: UI, original_text: str | bytes, result: InvariantCheckResult
 ) -> Iterable[str]:
     """Return verbose diagnostic lines, or an empty iterable when disabled."""
     if not ui.verbose or ui.quiet:
         return []
 
-    original_token_count = _count_tokens(original_text)
-    leftover_token_count = _count_tokens(result.leftover_transitions)
+    # The checker counted both while indexing, so no text is rescanned here.
+    original_token_count = result.original_token_count
+    leftover_token_count = result.leftover_token_count
 
     input_len = result.log_length
     left_len = result.leftover_length
@@ -214,6 +283,14 @@ def render_diagnostics(
 
 DEFAULT_PREVIEW_LIMIT = 200
 
+# Static substitution template equivalent to ui.bold(ui.red(token)):
+# BOLD + (RED + token + RESET) + RESET. Using a template keeps the whole
+# highlight pass inside the C regex engine instead of invoking a Python
+# callback per token.
+_TOKEN_HIGHLIGHT_TEMPLATE = (
+    f"{Colors.BOLD}{Colors.RED}\\1{Colors.RESET}{Colors.RESET}"
+)
+
 
 def render_leftover_preview(
     ui: UI, leftover: str, limit: int = DEFAULT_PREVIEW_LIMIT
@@ -230,7 +307,7 @@ def render_leftover_preview(
         preview = head + separator + tail
 
     if ui.color:
-        preview = _TOKEN_CAPTURE_RE.sub(lambda m: ui.bold(ui.red(m.group(1))), preview)
+        preview = _sub_token_capture(_TOKEN_HIGHLIGHT_TEMPLATE, preview)
     return [
         "",
         ui.yellow(
@@ -256,16 +333,21 @@ def render_status(ui: UI, result: InvariantCheckResult) -> Iterable[str]:
 def print_report(
     ui: UI,
     *,
-    original_text: str,
+    original_text: str | bytes,
     result: InvariantCheckResult,
     bar_width: int,
 ) -> None:
     """Print the full report (banner, counts, optional diagnostics, and status)."""
+    if ui.quiet:
+        # ui.info drops every line anyway; skip building bars, formatted
+        # rows and the preview altogether.
+        return
+    info = ui.info
     for line in render_banner(ui):
-        ui.info(line)
+        info(line)
     for line in render_counts(ui, result.invariant_counts, bar_width):
-        ui.info(line)
+        info(line)
     for line in render_diagnostics(ui, original_text, result):
-        ui.info(line)
+        info(line)
     for line in render_status(ui, result):
-        ui.info(line)
+        info(line)